@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 """Subclass of ``Group`` that serves as a base class for representing pseudo potential families."""
+import concurrent.futures
+import contextlib
+import io
 import os
-import re
-from typing import Union, List, Tuple, Mapping
+from typing import Union, KeysView, List, Tuple, Mapping
 
 from aiida.common import exceptions
-from aiida.common.lang import classproperty, type_check
+from aiida.common.lang import classproperty
+from aiida.manage.manager import get_manager
 from aiida.orm import Group, QueryBuilder
 from aiida.plugins import DataFactory
 
@@ -28,14 +31,15 @@ class PseudoPotentialFamily(Group):
     _key_pseudo_type = '_pseudo_type'
     _pseudo_types = (PseudoPotentialData,)
     _pseudos = None
+    _min_files_read_concurrently = 32
 
     def __repr__(self):
         """Represent the instance for debugging purposes."""
-        return f'{self.__class__.__name__}<{self.pk or self.uuid}>'
+        return f'{type(self).__name__}<{self.pk or self.uuid}>'
 
     def __str__(self):
         """Represent the instance for human-readable purposes."""
-        return f'{self.__class__.__name__}<{self.label}>'
+        return f'{type(self).__name__}<{self.label}>'
 
     def __init__(self, *args, **kwargs):
         """Validate that the ``_pseudo_types`` class attribute is a tuple of ``PseudoPotentialData`` subclasses."""
@@ -46,6 +50,11 @@ class PseudoPotentialFamily(Group):
 
         super().__init__(*args, **kwargs)
 
+        # A newly constructed family cannot contain any nodes yet, so the cache can be initialized without having to
+        # query the database for it once nodes are added after the family is stored.
+        if not self.is_stored:
+            self._pseudos = {}
+
     @classproperty
     def pseudo_types(cls):  # pylint: disable=no-self-argument
         """Return the pseudo potential types that this family accepts.
@@ -87,6 +96,34 @@ class PseudoPotentialFamily(Group):
 
         return dirpath
 
+    @staticmethod
+    def _read_file(filepath) -> bytes:
+        """Return the binary content of the file at ``filepath``."""
+        with open(filepath, 'rb') as handle:
+            return handle.read()
+
+    @classmethod
+    @contextlib.contextmanager
+    def _read_files(cls, entries):
+        """Return a context manager that yields an iterator over the binary contents of the given directory entries.
+
+        Reading the files is independent and I/O bound, so for directories with at least
+        ``_min_files_read_concurrently`` files, it is done concurrently in a thread pool. The contents are read lazily
+        and any reads that are still pending when the context is exited are cancelled, such that an error raised while
+        processing one of the files does not have to wait for all remaining files to be read.
+
+        :param entries: list of ``os.DirEntry`` instances of the files to read.
+        """
+        if len(entries) < cls._min_files_read_concurrently:
+            yield map(cls._read_file, entries)
+            return
+
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(entries))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            with contextlib.closing(executor.map(cls._read_file, entries)) as contents:
+                yield contents
+
     @classmethod
     def parse_pseudos_from_directory(cls, dirpath, pseudo_type=None, deduplicate=True):
         """Parse the pseudo potential files in the given directory into a list of data nodes.
@@ -109,47 +146,47 @@ class PseudoPotentialFamily(Group):
         :raises ValueError: if ``pseudo_type`` is not specified and the class supports more than one pseudo type.
         :raises ParsingError: if the constructor of the pseudo type fails for one of the files in the ``dirpath``.
         """
-        from aiida.common.exceptions import ParsingError
-
-        pseudos = []
+        pseudos = {}
         dirpath = cls._validate_dirpath(dirpath)
         pseudo_type = cls._validate_pseudo_type(pseudo_type)
 
-        for filename in os.listdir(dirpath):
-            filepath = os.path.join(dirpath, filename)
+        # The entries are sorted such that the files are parsed, and so errors are reported, in a deterministic order.
+        with os.scandir(dirpath) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+
+        if any(not entry.is_file() for entry in entries):
+            raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file')
 
-            if not os.path.isfile(filepath):
-                raise ValueError(f'dirpath `{dirpath}` contains at least one entry that is not a file')
+        constructor = pseudo_type.get_or_create if deduplicate else pseudo_type
 
-            with open(filepath, 'rb') as handle:
+        # Only reading the files may be done concurrently. The nodes are constructed in the current thread, since this
+        # can interact with the database, whose sessions are not thread safe.
+        with cls._read_files(entries) as contents:
+            for entry, content in zip(entries, contents):
                 try:
-                    if deduplicate:
-                        pseudo = pseudo_type.get_or_create(handle, filename=filename)
-                    else:
-                        pseudo = pseudo_type(handle, filename=filename)
-                except ParsingError as exception:
-                    raise ParsingError(f'failed to parse `{filepath}`: {exception}') from exception
-
-            if pseudo.element is None:
-                match = re.search(r'^([A-Za-z]{1,2})\.\w+', filename)
-                if match is None:
-                    raise ParsingError(
-                        f'`{pseudo.__class__}` constructor did not define the element and could not parse a valid '
-                        'element symbol from the filename `{filename}` either. It should have the format '
-                        '`ELEMENT.EXTENSION`'
-                    )
-                pseudo.element = match.group(1)
-            pseudos.append(pseudo)
+                    pseudo = constructor(io.BytesIO(content), filename=entry.name)
+                except exceptions.ParsingError as exception:
+                    raise exceptions.ParsingError(f'failed to parse `{entry.path}`: {exception}') from exception
 
-        if not pseudos:
-            raise ValueError(f'no pseudo potentials were parsed from `{dirpath}`')
+                if pseudo.element is None:
+                    head, sep, _ = entry.name.partition('.')
+                    if not sep or not 1 <= len(head) <= 2 or not head.isalpha():
+                        raise exceptions.ParsingError(
+                            f'`{pseudo.__class__}` constructor did not define the element and could not parse a valid '
+                            'element symbol from the filename `{filename}` either. It should have the format '
+                            '`ELEMENT.EXTENSION`'
+                        )
+                    pseudo.element = head
 
-        elements = set(pseudo.element for pseudo in pseudos)
+                if pseudo.element in pseudos:
+                    raise ValueError(f'directory `{dirpath}` contains pseudo potentials with duplicate elements')
 
-        if len(pseudos) != len(elements):
-            raise ValueError(f'directory `{dirpath}` contains pseudo potentials with duplicate elements')
+                pseudos[pseudo.element] = pseudo
 
-        return pseudos
+        if not pseudos:
+            raise ValueError(f'no pseudo potentials were parsed from `{dirpath}`')
+
+        return list(pseudos.values())
 
     @classmethod
     def create_from_folder(cls, dirpath, label, *, description='', pseudo_type=None, deduplicate=True):
@@ -163,6 +200,7 @@ class PseudoPotentialFamily(Group):
             a ``ValueError`` is raised.
         :param deduplicate: if True, will scan database for existing pseudo potentials of same type and with the same
             md5 checksum, and use that instead of the parsed one.
+        :raises TypeError: if ``description`` is not a ``str`` or ``None``.
         :raises ValueError: if a ``PseudoPotentialFamily`` already exists with the given name.
         :raises ValueError: if ``dirpath`` is not a directory or contains anything other than files.
         :raises ValueError: if ``dirpath`` contains multiple pseudo potentials for the same element.
@@ -170,7 +208,8 @@ class PseudoPotentialFamily(Group):
         :raises ValueError: if ``pseudo_type`` is not specified and the class supports more than one pseudo type.
         :raises ParsingError: if the constructor of the pseudo type fails for one of the files in the ``dirpath``.
         """
-        type_check(description, str, allow_none=True)
+        if description is not None and not isinstance(description, str):
+            raise TypeError(f'`description` should be a `str` or `None`, got: {type(description)}')
 
         try:
             cls.objects.get(label=label)
@@ -182,9 +221,14 @@ class PseudoPotentialFamily(Group):
         pseudos = cls.parse_pseudos_from_directory(dirpath, pseudo_type, deduplicate=deduplicate)
 
         # Only store the ``Group`` and the pseudo nodes now, such that we don't have to worry about the clean up in the
-        # case that an exception is raised during creating them.
+        # case that an exception is raised during creating them. The pseudos are stored within a single transaction,
+        # which is why ``with_transaction=False`` is passed, otherwise each call to ``store`` would commit separately.
         family.store()
-        family.add_nodes([pseudo.store() for pseudo in pseudos])
+
+        with get_manager().get_backend().transaction():
+            pseudos = [pseudo.store(with_transaction=False) for pseudo in pseudos]
+
+        family.add_nodes(pseudos)
 
         return family
 
@@ -218,6 +262,7 @@ class PseudoPotentialFamily(Group):
         :raises TypeError: if nodes are not an instance or list of instance of any of the classes listed by
             ``PseudoPotentialFamily._pseudo_types``.
         :raises ValueError: if any of the nodes are not stored or their elements already exist in this family.
+        :raises ValueError: if multiple nodes define the same element.
         """
         if not self.is_stored:
             raise exceptions.ModificationNotAllowed('cannot add nodes to an unstored group')
@@ -225,15 +270,20 @@ class PseudoPotentialFamily(Group):
         if not isinstance(nodes, (list, tuple)):
             nodes = [nodes]
 
-        if any(not isinstance(node, self._pseudo_types) for node in nodes):
-            raise TypeError(f'only nodes of types `{self._pseudo_types}` can be added: {nodes}')
+        pseudo_types = self._pseudo_types
 
+        if any(not isinstance(node, pseudo_types) for node in nodes):
+            raise TypeError(f'only nodes of types `{pseudo_types}` can be added: {nodes}')
+
+        elements = self._element_set()
         pseudos = {}
 
         # Check for duplicates before adding any pseudo to the internal cache
         for pseudo in nodes:
-            if pseudo.element in self.elements:
+            if pseudo.element in elements:
                 raise ValueError(f'element `{pseudo.element}` already present in this family')
+            if pseudo.element in pseudos:
+                raise ValueError(f'element `{pseudo.element}` is defined by more than one of the nodes to add')
             pseudos[pseudo.element] = pseudo
 
         self.pseudos.update(pseudos)
@@ -268,17 +318,34 @@ class PseudoPotentialFamily(Group):
         :return: dictionary of element symbol mapping pseudo potentials
         """
         if self._pseudos is None:
-            self._pseudos = {pseudo.element: pseudo for pseudo in self.nodes}
+            self._load_all_pseudos()
 
         return self._pseudos
 
+    def _load_all_pseudos(self):
+        """Load all pseudo potentials of this family from the database into the internal cache with a single query."""
+        builder = QueryBuilder()
+        builder.append(self.__class__, filters={'id': self.pk}, tag='group')
+        builder.append(self._pseudo_types, with_group='group', project=['attributes.element', '*'])
+        self._pseudos = dict(builder.all())
+
     @property
     def elements(self):
         """Return the list of elements for which this family defines a pseudo potential.
 
         :return: list of element symbols
         """
-        return list(self.pseudos.keys())
+        return list(self.pseudos)
+
+    def _element_set(self) -> KeysView:
+        """Return a view of the elements for which this family defines a pseudo potential.
+
+        Unlike ``elements``, this does not copy the element symbols into a new list, which makes it suited for
+        membership tests.
+
+        :return: view of the element symbols
+        """
+        return self.pseudos.keys()
 
     def get_pseudo(self, element):
         """Return the pseudo potential for the given element.
@@ -7,7 +7,7 @@ import os
 import pytest
 
 from aiida.common import exceptions
-from aiida.orm import QueryBuilder
+from aiida.orm import QueryBuilder, load_group
 
 from aiida_pseudo.data.pseudo import PseudoPotentialData
 from aiida_pseudo.groups.family.pseudo import PseudoPotentialFamily
@@ -144,6 +144,28 @@ def test_create_from_folder_parse_fail(tmpdir):
         PseudoPotentialFamily.create_from_folder(str(tmpdir), 'label')
 
 
+@pytest.mark.usefixtures('clear_db')
+def test_create_from_folder_store_fail(filepath_pseudos, monkeypatch):
+    """Test that `PseudoPotentialFamily.create_from_folder` stores no pseudos if storing one of them fails."""
+    store = PseudoPotentialData.store
+    stored = []
+
+    def store_fail(self, **kwargs):
+        """Store the first pseudo and fail for the ones after that."""
+        if stored:
+            raise exceptions.StoringNotAllowed('storing failed')
+        stored.append(self)
+        return store(self, **kwargs)
+
+    monkeypatch.setattr(PseudoPotentialData, 'store', store_fail)
+
+    with pytest.raises(exceptions.StoringNotAllowed, match='storing failed'):
+        PseudoPotentialFamily.create_from_folder(filepath_pseudos(), 'label')
+
+    assert len(stored) == 1
+    assert QueryBuilder().append(PseudoPotentialData).count() == 0
+
+
 @pytest.mark.usefixtures('clear_db')
 def test_create_from_folder_empty(tmpdir):
     """Test the `PseudoPotentialFamily.create_from_folder` class method for empty folder."""
@@ -222,6 +244,33 @@ def test_parse_pseudos_from_directory_incorrect_pseudo_type(tmpdir):
         SomeFamily.parse_pseudos_from_directory(str(tmpdir), pseudo_type=PsmlData)
 
 
+@pytest.mark.usefixtures('clear_db')
+def test_parse_pseudos_from_directory_duplicate_element(tmpdir):
+    """Test that `PseudoPotentialFamily.parse_pseudos_from_directory` raises for a duplicate element right away.
+
+    The files are parsed in alphabetical order, so the duplicate ``Ar`` should be detected before the file ``Zzz.upf``,
+    whose element cannot be parsed from its filename, is parsed, which would raise a ``ParsingError`` instead.
+    """
+    for filename in ['Ar.UPF', 'Ar.upf', 'Zzz.upf']:
+        with open(os.path.join(str(tmpdir), filename), 'wb'):
+            pass
+
+    with pytest.raises(ValueError, match=r'directory `.*` contains pseudo potentials with duplicate elements'):
+        PseudoPotentialFamily.parse_pseudos_from_directory(str(tmpdir))
+
+
+@pytest.mark.usefixtures('clear_db')
+def test_parse_pseudos_from_directory_concurrent(filepath_pseudos, monkeypatch):
+    """Test the `PseudoPotentialFamily.parse_pseudos_from_directory` class method when reading files concurrently."""
+    pseudos = PseudoPotentialFamily.parse_pseudos_from_directory(filepath_pseudos(), deduplicate=False)
+
+    monkeypatch.setattr(PseudoPotentialFamily, '_min_files_read_concurrently', 1)
+    pseudos_concurrent = PseudoPotentialFamily.parse_pseudos_from_directory(filepath_pseudos(), deduplicate=False)
+
+    expected = {pseudo.element: pseudo.md5 for pseudo in pseudos}
+    assert {pseudo.element: pseudo.md5 for pseudo in pseudos_concurrent} == expected
+
+
 @pytest.mark.usefixtures('clear_db')
 def test_add_nodes(get_pseudo_family, get_pseudo_potential_data):
     """Test that `PseudoPotentialFamily.add_nodes` method."""
@@ -312,6 +361,18 @@ def test_add_nodes_duplicate_element(get_pseudo_family, get_pseudo_potential_dat
         family.add_nodes(pseudo)
 
 
+@pytest.mark.usefixtures('clear_db')
+def test_add_nodes_duplicate_element_nodes(get_pseudo_family, get_pseudo_potential_data):
+    """Test that `PseudoPotentialFamily.add_nodes` fails if multiple pseudos with the same element are added."""
+    family = get_pseudo_family(elements=('Ar',))
+    pseudos = [get_pseudo_potential_data('He').store(), get_pseudo_potential_data('He').store()]
+
+    with pytest.raises(ValueError, match='element `He` is defined by more than one of the nodes to add'):
+        family.add_nodes(pseudos)
+
+    assert family.count() == 1
+
+
 @pytest.mark.usefixtures('clear_db')
 def test_remove_nodes(get_pseudo_family):
     """Test the ``PseudoPotentialFamily.remove_nodes`` method."""
@@ -369,6 +430,26 @@ def test_pseudos(get_pseudo_potential_data):
     assert family.pseudos == pseudos
 
 
+@pytest.mark.usefixtures('clear_db')
+def test_pseudos_cache(get_pseudo_potential_data):
+    """Test the cache of the `PseudoPotentialFamily.pseudos` property for new and loaded families."""
+    family = PseudoPotentialFamily(label='label')
+    assert family.pseudos == {}
+
+    pseudos = {
+        'Ar': get_pseudo_potential_data('Ar').store(),
+        'He': get_pseudo_potential_data('He').store(),
+    }
+    family.store()
+    family.add_nodes(list(pseudos.values()))
+    assert family.pseudos == pseudos
+
+    # A loaded family does not go through the constructor, so its cache should be loaded from the database
+    loaded = load_group(family.pk)
+    expected = {element: pseudo.uuid for element, pseudo in pseudos.items()}
+    assert {element: pseudo.uuid for element, pseudo in loaded.pseudos.items()} == expected
+
+
 @pytest.mark.usefixtures('clear_db')
 def test_pseudos_mutate(get_pseudo_family, get_pseudo_potential_data):
     """Test that `PseudoPotentialFamily.pseudos` property does not act as a setter."""